@@ -11,104 +11,217 @@ and an additional Image column will be added to the CSV with an <img src="...">
 Place the CSV and images in the same folder when importing into Anki so the importer can copy the media.
 """
 
+import os
 import sys
 import re
 import csv
+import sqlite3
+import string
+import hashlib
+import asyncio
 import argparse
 import subprocess
 import unicodedata
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Google Translate rejects payloads over 5000 characters; stay safely below it
+TRANSLATE_CHUNK_MAX_CHARS = 4500
+# Rare token used to join several subtitles into a single translation request
+TRANSLATE_SEPARATOR = "\n@@@\n"
+# Upper bound on frames per batched ffmpeg call (each one is a separately opened input)
+SCREENSHOT_BATCH_MAX_FRAMES = 24
+# Upper bound on video inputs (demuxer + decoder) open at once across all ffmpeg jobs
+SCREENSHOT_MAX_OPEN_INPUTS = 64
+# Child processes get no stdin (some ffmpeg builds stall probing a terminal) and no output.
+# Python opens files non-inheritable, so on POSIX the close_fds sweep of the fd table is skipped.
+SUBPROCESS_QUIET_KWARGS = {
+    "stdin": subprocess.DEVNULL,
+    "stdout": subprocess.DEVNULL,
+    "stderr": subprocess.DEVNULL,
+    "close_fds": os.name != "posix",
+}
+# Anki shows images at flashcard size, so full-resolution frames only waste space
+DEFAULT_IMAGE_WIDTH = 640
+# Stay well under the Windows command-line limit of 32767 characters
+MAX_COMMAND_LINE_CHARS = 30000
+
+_RE_INDEX = re.compile(r"^\d+$")
+_RE_TIMELINE = re.compile(r"^(\d{2}:\d{2}:\d{2},\d{3})\s+-->\s+(\d{2}:\d{2}:\d{2},\d{3})")
+_RE_BRACKET = re.compile(r"^\[.*\]$")
+_TRIVIAL = frozenset({
+    "ah", "ah.", "eh", "eh.", "uh", "uh.", "oh", "oh.",
+    "mm", "mm.", "mmm", "mmm.", "hmm", "hmm.", "m", "m."
+})
+# Every character str.isspace() accepts (all in the BMP), matching the regex \s class
+_WHITESPACE_CHARS = "".join(chr(c) for c in range(0x10000) if chr(c).isspace())
+_LEADING_NOISE_CHARS = "-—–_" + _WHITESPACE_CHARS
+_TRAILING_NOISE_CHARS = _WHITESPACE_CHARS + ".,!?…·•;:¡¿"
+# Speed heuristic: lines this long skip the letter/name/interjection patterns. Heavily
+# edge-padded lines (e.g. "- - - ... Pedro:") are kept in exchange for skipping the regexes
+_FILTER_PATTERN_MAX_LEN = 32
+# Single letter (e.g. "M") or capitalized name alone, checked once on the stripped text
+_RE_FILTER_ONESHOT = re.compile(r"^(?:[A-Za-zÁÉÍÓÚÑáéíóúñ]|[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)$")
+_RE_TOKENS = re.compile(r"[A-Za-zÁÉÍÓÚÑáéíóúñ]+")
+_RE_SEPARATOR = re.compile(r"\s*@@@\s*")
+_RE_SPANISH_SRT = re.compile(r"\.es([\._\-].*)?\.srt$")
+_RE_TITLE_LANG = re.compile(r"^(?P<title>.+?)\.(?P<lang>[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,4})?)$")
+# YouTube IDs are always 11 characters from this alphabet, following one of these markers
+_YOUTUBE_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+# "v=" only counts as a query parameter, i.e. right after '?' or '&'
+_YOUTUBE_ID_MARKERS = ["v=", "youtu.be/", "/shorts/", "/embed/"]
+# Dash-like characters and characters forbidden in filenames all become '-'
+_SANITIZE_MAP = {ord(c): "-" for c in "\u2010\u2011\u2012\u2013\u2014\u2015\u2212\uFE58\uFE63\uFF0D\\/:*?\"<>|"}
+_RE_SPACES = re.compile(r"\s+")
+_RE_HYPHENS = re.compile(r"-+")
+
+
+def _timestamp_to_seconds(ts: str) -> float:
+    """Convert an already-validated 'HH:MM:SS,mmm' timestamp by slicing its fixed layout."""
+    return int(ts[0:2]) * 3600 + int(ts[3:5]) * 60 + int(ts[6:8]) + int(ts[9:12]) / 1000.0
 
 
 def parse_timestamp_to_seconds(timestamp: str) -> float:
-    match = re.match(r"^(\d{2}):(\d{2}):(\d{2}),(\d{3})$", timestamp)
-    if not match:
+    if not (len(timestamp) == 12 and timestamp[2] == ":" and timestamp[5] == ":" and timestamp[8] == ","
+            and (timestamp[0:2] + timestamp[3:5] + timestamp[6:8] + timestamp[9:12]).isdigit()):
         raise ValueError(f"Invalid timestamp: {timestamp}")
-    hours, minutes, seconds, millis = map(int, match.groups())
-    return hours * 3600 + minutes * 60 + seconds + millis / 1000.0
+    return _timestamp_to_seconds(timestamp)
 
 
-def parse_srt_with_timing(lines: List[str]) -> List[Tuple[int, float, float, str]]:
+_STATE_INDEX, _STATE_TIME, _STATE_TEXT = range(3)
+
+
+def _iter_split_lines(line_iter: Iterable[str]) -> Iterator[str]:
+    """
+    Re-split each line with str.splitlines() so that \x0c, \x1c-\x1e, \x85, U+2028 and
+    U+2029 still break lines as they did with read().splitlines().
+    """
+    for raw_line in line_iter:
+        # A bare "\n" splits into no parts but is still one blank line
+        yield from raw_line.splitlines() or [""]
+
+
+def parse_srt_with_timing(line_iter: Iterable[str]) -> Iterator[Tuple[int, float, float, str]]:
     """
-    Returns a list of tuples: (index, start_seconds, end_seconds, text)
+    Yields tuples: (index, start_seconds, end_seconds, text), consuming lines lazily.
     Joins multi-line subtitle text within the same block with spaces.
     Filters out bracketed notes-only lines within a block.
     """
-    blocks: List[Tuple[int, float, float, str]] = []
-    i = 0
-    n = len(lines)
-    while i < n:
-        # Skip empty lines
-        if not lines[i].strip():
-            i += 1
-            continue
-        # Index line
-        index_line = lines[i].strip()
-        if not re.match(r"^\d+$", index_line):
-            # Unexpected; try to continue searching
-            i += 1
-            continue
-        try:
-            idx = int(index_line)
-        except ValueError:
-            i += 1
-            continue
-        i += 1
-        if i >= n:
-            break
-        # Timestamp line
-        time_line = lines[i].strip()
-        time_match = re.match(r"^(\d{2}:\d{2}:\d{2},\d{3})\s+-->\s+(\d{2}:\d{2}:\d{2},\d{3})", time_line)
-        if not time_match:
-            i += 1
-            continue
-        start_ts, end_ts = time_match.groups()
-        start_s = parse_timestamp_to_seconds(start_ts)
-        end_s = parse_timestamp_to_seconds(end_ts)
-        i += 1
-        # Collect text lines until blank line
-        text_lines: List[str] = []
-        while i < n and lines[i].strip():
-            line_text = lines[i].strip()
-            # Skip bracketed notes like [Música]
-            if re.match(r"^\[.*\]$", line_text):
-                i += 1
+    state = _STATE_INDEX
+    idx = 0
+    start_s = end_s = 0.0
+    text_lines: List[str] = []
+    for raw_line in _iter_split_lines(line_iter):
+        line = raw_line.strip()
+        if state == _STATE_INDEX:
+            # Skip blank separators and anything unexpected until an index line
+            if _RE_INDEX.match(line):
+                idx = int(line)
+                state = _STATE_TIME
+        elif state == _STATE_TIME:
+            time_match = _RE_TIMELINE.match(line)
+            if not time_match:
+                state = _STATE_INDEX
                 continue
-            text_lines.append(line_text)
-            i += 1
-        # Skip the blank line separator
-        while i < n and not lines[i].strip():
-            i += 1
-        if not text_lines:
-            continue
-        merged_text = " ".join(text_lines)
-        blocks.append((idx, start_s, end_s, merged_text))
-    return blocks
-
-
-def extract_screenshot(video_path: str, timestamp_sec: float, output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    # Use -ss before input for fast seek and after input for accuracy
-    cmd = [
+            start_ts, end_ts = time_match.groups()
+            # The timeline pattern already guarantees the HH:MM:SS,mmm layout
+            start_s = _timestamp_to_seconds(start_ts)
+            end_s = _timestamp_to_seconds(end_ts)
+            text_lines = []
+            state = _STATE_TEXT
+        elif line:
+            # Skip bracketed notes like [Música]
+            if not _RE_BRACKET.match(line):
+                text_lines.append(line)
+        else:
+            if text_lines:
+                yield (idx, start_s, end_s, " ".join(text_lines))
+            state = _STATE_INDEX
+    if state == _STATE_TEXT and text_lines:
+        yield (idx, start_s, end_s, " ".join(text_lines))
+
+
+def _image_encode_args(image_width: int, image_format: str) -> List[str]:
+    args: List[str] = []
+    if image_width > 0:
+        # Downscale to the card-sized width (never upscale), keeping an even height
+        args += ["-vf", f"scale='min({image_width},iw)':-2"]
+    if image_format == "webp":
+        args += ["-c:v", "libwebp", "-quality", "75"]
+    else:
+        args += ["-q:v", "4"]
+    return args
+
+
+def _screenshot_cmd(video_path: str, timestamp_sec: float, output_path: Path, image_width: int = DEFAULT_IMAGE_WIDTH, image_format: str = "jpg") -> List[str]:
+    # -ss before input seeks to the nearest keyframe and, since ffmpeg 2.1 (accurate_seek),
+    # decodes forward to the exact frame when transcoding
+    return [
         "ffmpeg",
         "-y",
         "-ss",
         f"{timestamp_sec:.3f}",
         "-i",
         video_path,
+        "-an",
+        "-sn",
         "-frames:v",
         "1",
-        "-q:v",
-        "2",
+        *_image_encode_args(image_width, image_format),
         str(output_path),
     ]
+
+
+def _screenshot_batch_cmd(video_path: str, timestamps: List[float], output_paths: List[Path], image_width: int = DEFAULT_IMAGE_WIDTH, image_format: str = "jpg") -> List[str]:
+    # One fast-seeked input per frame, each mapped to its own output file
+    encode_args = _image_encode_args(image_width, image_format)
+    cmd = ["ffmpeg", "-y"]
+    for timestamp_sec in timestamps:
+        # Single-threaded decoders: parallelism comes from running several jobs instead
+        cmd += ["-threads", "1", "-ss", f"{timestamp_sec:.3f}", "-i", video_path]
+    for input_index, output_path in enumerate(output_paths):
+        cmd += ["-map", f"{input_index}:v:0", "-an", "-sn", "-frames:v", "1", *encode_args, str(output_path)]
+    return cmd
+
+
+async def _run_ffmpeg_async(cmd: List[str]) -> int:
+    """Run an ffmpeg command without blocking the event loop and return its exit code."""
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        proc = await asyncio.create_subprocess_exec(*cmd, **SUBPROCESS_QUIET_KWARGS)
     except FileNotFoundError:
         raise RuntimeError("ffmpeg not found. Please install ffmpeg and try again.")
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"ffmpeg failed when extracting {output_path.name}") from e
+    try:
+        return await proc.wait()
+    except asyncio.CancelledError:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        # Reap the killed child before the event loop can close underneath it
+        await asyncio.shield(proc.wait())
+        raise
+
+
+async def extract_screenshots_batch(video_path: str, timestamps: List[float], output_paths: List[Path], image_width: int = DEFAULT_IMAGE_WIDTH, image_format: str = "jpg") -> None:
+    """
+    Extract one frame per timestamp with a single ffmpeg process.
+    Each frame gets its own fast-seeked input mapped to its own output, so frames land
+    on exactly the requested names. Falls back to one ffmpeg call per frame if the
+    command line would get too long or the batched call fails.
+    """
+    if not output_paths:
+        return
+    for output_path in output_paths:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    cmd = _screenshot_batch_cmd(video_path, timestamps, output_paths, image_width, image_format)
+    if len(output_paths) > 1 and sum(len(arg) + 1 for arg in cmd) <= MAX_COMMAND_LINE_CHARS:
+        if await _run_ffmpeg_async(cmd) == 0:
+            return
+    for timestamp_sec, output_path in zip(timestamps, output_paths):
+        if await _run_ffmpeg_async(_screenshot_cmd(video_path, timestamp_sec, output_path, image_width, image_format)) != 0:
+            raise RuntimeError(f"ffmpeg failed when extracting {output_path.name}")
 
 
 def should_filter_subtitle_text(text: str) -> bool:
@@ -117,43 +230,163 @@ def should_filter_subtitle_text(text: str) -> bool:
     if not t:
         return True
     lower = t.lower()
-    trivial = {
-        "ah", "ah.", "eh", "eh.", "uh", "uh.", "oh", "oh.",
-        "mm", "mm.", "mmm", "mmm.", "hmm", "hmm.", "m", "m."
-    }
-    # Remove leading dashes and trailing punctuation for checks
-    lower_stripped = re.sub(r"^[\-—–_\s]+|[\s\.,!\?…·•;:¡¿]+$", "", lower)
-    if lower in trivial or lower_stripped in trivial:
-        return True
-    # Single-letter with optional period, e.g., "M" or "M."
-    if re.match(r"^[a-záéíóúñ]\.?$", lower_stripped):
+    if lower in _TRIVIAL:
         return True
-    # Speaker/name-only line: allow trailing punctuation like '.', '!', '?', ':'
-    caps_stripped = re.sub(r"^[\-—–_\s]+|[\s\.,!\?…·•;:¡¿]+$", "", t)
-    if re.match(r"^[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+$", caps_stripped):
+    # Remove leading dashes and trailing punctuation for checks
+    caps_stripped = t.lstrip(_LEADING_NOISE_CHARS).rstrip(_TRAILING_NOISE_CHARS)
+    lower_stripped = caps_stripped.lower()
+    if lower_stripped in _TRIVIAL:
         return True
-    if re.match(r"^[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+:$", t.strip()):
+    # Typical dialogue lines are too long for any of the checks below
+    if len(t) >= _FILTER_PATTERN_MAX_LEN:
+        return False
+    # Single-letter ("M", "M.") or speaker/name-only line ("María:", "Pedro!"); the
+    # trailing punctuation, colon included, is already gone from caps_stripped
+    if _RE_FILTER_ONESHOT.match(caps_stripped):
         return True
     # Very short 1-2 token interjection-like phrases
-    tokens = re.findall(r"[A-Za-zÁÉÍÓÚÑáéíóúñ]+", t)
+    tokens = _RE_TOKENS.findall(t)
     if len(tokens) <= 2:
         joined = " ".join(tok.lower() for tok in tokens)
-        if joined in trivial:
+        if joined in _TRIVIAL:
             return True
     return False
 
 
-def srt_to_anki_csv(input_path: str, output_path: str, video_path: Optional[str] = None, media_dir: Optional[str] = None, image_name_prefix: Optional[str] = None):
-    print(f"Reading SRT: {input_path}")
-    with open(input_path, "r", encoding="utf-8") as f:
-        lines = f.read().splitlines()
+def _chunk_texts(texts: List[str], max_chars: int = TRANSLATE_CHUNK_MAX_CHARS) -> List[List[str]]:
+    """Group texts so that each group, joined with the separator, stays under max_chars."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_len = 0
+    for text in texts:
+        added = len(text) + (len(TRANSLATE_SEPARATOR) if current else 0)
+        if current and current_len + added > max_chars:
+            chunks.append(current)
+            current = []
+            current_len = 0
+            added = len(text)
+        current.append(text)
+        current_len += added
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _translate_chunk(translator, chunk: List[str]) -> List[str]:
+    """Translate a group of texts with one request, falling back to one request per text."""
+    # GoogleTranslator returns None when Google echoes back text with no letters or digits
+    if len(chunk) == 1:
+        return [translator.translate(chunk[0]) or ""]
+    joined = translator.translate(TRANSLATE_SEPARATOR.join(chunk)) or ""
+    parts = [part.strip() for part in _RE_SEPARATOR.split(joined.strip())]
+    if len(parts) == len(chunk):
+        return parts
+    # The separator did not survive translation intact; translate individually
+    return [translated or "" for translated in translator.translate_batch(chunk)]
+
+
+def default_translation_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "translate-srt-to-anki" / "translations.sqlite3"
+
+
+def open_translation_cache(cache_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the SQLite translation cache at cache_path."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(cache_path))
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+    conn.commit()
+    return conn
+
+
+def _translation_cache_key(source: str, target: str, text: str) -> str:
+    return hashlib.sha1(f"{source}\0{target}\0{text}".encode("utf-8")).hexdigest()
+
+
+def lookup_cached_translations(cache: sqlite3.Connection, translator, texts: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Split texts into ({text: cached translation}, [texts missing from the cache])."""
+    hits: Dict[str, str] = {}
+    misses: List[str] = []
+    for text in texts:
+        key = _translation_cache_key(translator.source, translator.target, text)
+        row = cache.execute("SELECT translation FROM cache WHERE key=?", (key,)).fetchone()
+        if row:
+            hits[text] = row[0]
+        else:
+            misses.append(text)
+    return hits, misses
 
-    print("Parsing subtitles ...")
-    blocks = parse_srt_with_timing(lines)
-    print(f"Parsed {len(blocks)} blocks")
 
-    before_filter = len(blocks)
-    blocks = [b for b in blocks if not should_filter_subtitle_text(b[3])]
+def store_cached_translations(cache: sqlite3.Connection, translator, translated: Dict[str, str]) -> None:
+    # One transaction per request avoids a sync per row; the column is NOT NULL, so
+    # a missing translation is stored as the empty string written to the CSV
+    with cache:
+        cache.executemany(
+            "INSERT OR REPLACE INTO cache (key, translation) VALUES (?, ?)",
+            [(_translation_cache_key(translator.source, translator.target, text), en or "") for text, en in translated.items()],
+        )
+
+
+def _iter_rows(blocks: List[Tuple[int, float, float, str]], positions: Iterable[int], text_to_en: Dict[str, str], image_names: List[str]) -> Iterator[List[str]]:
+    """Yield CSV rows for the given block positions, printing progress as they are consumed."""
+    total = len(blocks)
+    for i in positions:
+        es_text = blocks[i][3]
+        row = [es_text, text_to_en[es_text]]
+        if image_names:
+            row.append(f"<img src='{image_names[i]}'>")
+        yield row
+        done = i + 1
+        if done == total or done % 25 == 0:
+            sys.stdout.write(f"\r  progress: {done}/{total}")
+            sys.stdout.flush()
+
+
+def _read_resume_state(csv_path: Path, header: List[str]) -> Counter:
+    """
+    Count the Spanish texts already written to csv_path by an earlier run.
+    A trailing row cut off by an interrupted write is truncated away so appends stay aligned,
+    and a CSV written with different columns (e.g. without --video) is refused.
+    """
+    with open(csv_path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                # Scan backwards in blocks for the last complete line instead of reading the file
+                pos = end
+                cut = 0
+                while pos > 0:
+                    step = min(8192, pos)
+                    pos -= step
+                    f.seek(pos)
+                    newline = f.read(step).rfind(b"\n")
+                    if newline != -1:
+                        cut = pos + newline + 1
+                        break
+                f.truncate(cut)
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        existing_header = next(reader, None)
+        if existing_header is not None and existing_header != header:
+            raise SystemExit(
+                f"Cannot resume: {csv_path} has columns {existing_header}, expected {header}. "
+                "Use the same --video setting as the original run, or choose a new output file."
+            )
+        return Counter(row[0] for row in reader if row)
+
+
+def srt_to_anki_csv(input_path: str, output_path: str, video_path: Optional[str] = None, media_dir: Optional[str] = None, image_name_prefix: Optional[str] = None, cache_path: Optional[Path] = None, ffmpeg_jobs: Optional[int] = None, resume: bool = False, image_width: int = DEFAULT_IMAGE_WIDTH, image_format: str = "jpg"):
+    print(f"Reading and parsing SRT: {input_path}")
+    before_filter = 0
+    blocks: List[Tuple[int, float, float, str]] = []
+    with open(input_path, "r", encoding="utf-8") as f:
+        for block in parse_srt_with_timing(f):
+            before_filter += 1
+            if not should_filter_subtitle_text(block[3]):
+                blocks.append(block)
+    print(f"Parsed {before_filter} blocks")
+
     removed_filter = before_filter - len(blocks)
     print(f"Filtering trivial/name-only lines: kept {len(blocks)} (removed {removed_filter})")
 
@@ -185,40 +418,122 @@ def srt_to_anki_csv(input_path: str, output_path: str, video_path: Optional[str]
         media_root.mkdir(parents=True, exist_ok=True)
         image_rel_prefix = media_root.name
 
-    total = len(blocks)
-    if video_path:
-        print(f"Translating and extracting screenshots for {total} subtitles ...")
-    else:
-        print(f"Translating {total} subtitles ...")
+    # Image numbers follow block position so a resumed run keeps its filenames aligned
+    block_numbers = list(range(1, len(blocks) + 1))
+    header = ["Spanish", "English", "Image"] if video_path else ["Spanish", "English"]
+    resuming = resume and output_csv_path.exists()
+    if resuming:
+        already_done = _read_resume_state(output_csv_path, header)
+        pending = []
+        for number, block in zip(block_numbers, blocks):
+            # Count occurrences so repeated texts in video mode are skipped only as often as written
+            if already_done[block[3]] > 0:
+                already_done[block[3]] -= 1
+            else:
+                pending.append((number, block))
+        print(f"Resuming: {len(blocks) - len(pending)} subtitles already in {output_path}")
+        block_numbers = [number for number, block in pending]
+        blocks = [block for number, block in pending]
 
-    rows: List[List[str]] = []
+    total = len(blocks)
     prefix = image_name_prefix or Path(input_path).stem
-    for i, (idx, start_s, end_s, es_text) in enumerate(blocks, start=1):
-        en_text = translator.translate(es_text)
+    image_names: List[str] = []
+    if video_path:
+        image_names = [f"{prefix}-{number:04d}.{image_format}" for number in block_numbers]
+        jobs = max(1, ffmpeg_jobs or os.cpu_count() or 1)
+        print(f"Extracting screenshots for {total} subtitles ({jobs} ffmpeg jobs) ...")
+        midpoints = [start_s + max(0.0, (end_s - start_s)) / 2.0 for idx, start_s, end_s, es_text in blocks]
+        image_paths = [media_root / image_name for image_name in image_names]
+        # Spread frames evenly over the jobs, with one ffmpeg process per batch, while
+        # keeping frames x jobs (open inputs) bounded however many CPUs there are
+        batch_size = max(1, min(SCREENSHOT_BATCH_MAX_FRAMES, SCREENSHOT_MAX_OPEN_INPUTS // jobs, -(-total // jobs)))
+
+    # Translate each distinct text once; video mode keeps duplicate rows for their screenshots
+    unique_texts = list(dict.fromkeys(b[3] for b in blocks))
+    print(f"Translating {len(unique_texts)} unique texts for {total} subtitles ...")
+
+    async def pipeline(writer, f, cache: Optional[sqlite3.Connection]) -> None:
+        # Translation requests, ffmpeg processes and CSV writes all overlap on one event loop
+        loop = asyncio.get_running_loop()
+        translations: asyncio.Queue = asyncio.Queue(maxsize=32)
+        row_tasks: Dict[int, asyncio.Future] = {}
         if video_path:
-            midpoint = start_s + max(0.0, (end_s - start_s)) / 2.0
-            image_name = f"{prefix}-{i:04d}.jpg"
-            image_path = media_root / image_name
-            extract_screenshot(video_path, midpoint, image_path)
-            image_field = f"<img src='{image_name}'>"
-            rows.append([es_text, en_text, image_field])
-        else:
-            rows.append([es_text, en_text])
-        if i == total or i % 25 == 0:
-            sys.stdout.write(f"\r  progress: {i}/{total}")
-            sys.stdout.flush()
-    if total:
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+            semaphore = asyncio.Semaphore(jobs)
+
+            async def screenshot_worker(rows: List[int]) -> None:
+                async with semaphore:
+                    await extract_screenshots_batch(video_path, [midpoints[i] for i in rows], [image_paths[i] for i in rows], image_width, image_format)
+
+            # Each ffmpeg process gets a disjoint, contiguous time range of the video,
+            # even if the SRT lists its blocks out of order
+            by_time = sorted(range(total), key=lambda i: midpoints[i])
+            for start in range(0, total, batch_size):
+                rows = by_time[start:start + batch_size]
+                task = asyncio.ensure_future(screenshot_worker(rows))
+                for i in rows:
+                    row_tasks[i] = task
+
+        async def translate_worker() -> None:
+            misses = unique_texts
+            if cache is not None:
+                hits, misses = lookup_cached_translations(cache, translator, unique_texts)
+                print(f"Translation cache: {len(hits)} hits, {len(misses)} misses")
+                if hits:
+                    await translations.put(hits)
+            for chunk in _chunk_texts(misses):
+                translated = dict(zip(chunk, await loop.run_in_executor(None, _translate_chunk, translator, chunk)))
+                if cache is not None:
+                    store_cached_translations(cache, translator, translated)
+                await translations.put(translated)
+            # Only a normal finish sends the sentinel; on failure the writer is cancelled instead
+            await translations.put(None)
+
+        async def write_worker() -> None:
+            text_to_en: Dict[str, str] = {}
+            written = 0
+            while True:
+                translated = await translations.get()
+                if translated is None:
+                    break
+                text_to_en.update(translated)
+                # Every row, in order, whose translation is now known
+                ready = written
+                while ready < total and blocks[ready][3] in text_to_en:
+                    ready += 1
+                if video_path:
+                    # Rows are only written once their screenshots exist on disk
+                    await asyncio.gather(*dict.fromkeys(row_tasks[i] for i in range(written, ready)))
+                writer.writerows(_iter_rows(blocks, range(written, ready), text_to_en, image_names))
+                f.flush()
+                written = ready
+
+        workers = [asyncio.ensure_future(translate_worker()), asyncio.ensure_future(write_worker())]
+        try:
+            # If either worker fails, stop the other rather than leave it blocked on the queue
+            done, pending = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            tasks = [*workers, *row_tasks.values()]
+            for task in tasks:
+                task.cancel()
+            # Let cancelled batches kill and reap their ffmpeg processes
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     print(f"Writing CSV to {output_path} ...")
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
+    with open(output_path, "a" if resuming else "w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
-        if video_path:
-            writer.writerow(["Spanish", "English", "Image"])
-        else:
-            writer.writerow(["Spanish", "English"])
-        writer.writerows(rows)
+        if f.tell() == 0:
+            writer.writerow(header)
+        cache = open_translation_cache(cache_path) if cache_path else None
+        try:
+            asyncio.run(pipeline(writer, f, cache))
+        finally:
+            if cache is not None:
+                cache.close()
+    if total:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
 
     print(f"CSV saved to {output_path}")
 
@@ -228,14 +543,12 @@ def _choose_best_srt_file(candidates: List[Path]) -> Optional[Path]:
         return None
     def lang_score(p: Path) -> int:
         name = p.name
-        return 0 if re.search(r"\.es([\._\-].*)?\.srt$", name) else 1
+        return 0 if _RE_SPANISH_SRT.search(name) else 1
     def is_auto(p: Path) -> int:
         return 1 if "auto" in p.name.lower() else 0
-    sorted_candidates = sorted(
-        candidates,
-        key=lambda p: (lang_score(p), is_auto(p), -p.stat().st_mtime)
-    )
-    return sorted_candidates[0]
+    # Stat each file exactly once; the position keeps ties in their original order
+    decorated = [(lang_score(p), is_auto(p), -p.stat().st_mtime, i, p) for i, p in enumerate(candidates)]
+    return min(decorated)[4]
 
 
 def download_subtitles_with_yt_dlp(url: str, out_dir: Path, sub_langs: str = "es,es-ES,es-419") -> Path:
@@ -255,7 +568,7 @@ def download_subtitles_with_yt_dlp(url: str, out_dir: Path, sub_langs: str = "es
         url,
     ]
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(cmd, check=True, **SUBPROCESS_QUIET_KWARGS)
     except FileNotFoundError:
         raise RuntimeError("yt-dlp not found. Please install yt-dlp and try again.")
     except subprocess.CalledProcessError as e:
@@ -281,7 +594,7 @@ def download_video_with_yt_dlp(url: str, out_dir: Path) -> Path:
         url,
     ]
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(cmd, check=True, **SUBPROCESS_QUIET_KWARGS)
     except FileNotFoundError:
         raise RuntimeError("yt-dlp not found. Please install yt-dlp and try again.")
     except subprocess.CalledProcessError as e:
@@ -292,7 +605,8 @@ def download_video_with_yt_dlp(url: str, out_dir: Path) -> Path:
         candidates.extend(out_dir.glob(pattern))
     if not candidates:
         raise RuntimeError("Video download completed but no output video file was found.")
-    chosen = sorted(candidates, key=lambda p: -p.stat().st_mtime)[0]
+    # Newest file wins; max() stats each candidate once and needs no full sort
+    chosen = max(candidates, key=lambda p: p.stat().st_mtime)
     print(f"[yt-dlp] Video saved: {chosen}")
     return chosen
 
@@ -304,7 +618,7 @@ def _is_url(value: str) -> bool:
 def _derive_title_from_srt_filename(srt_path: Path) -> str:
     """Return a clean title from an SRT filename like 'Title.es.srt' -> 'Title'."""
     stem = srt_path.stem  # e.g., 'My Video.es'
-    m = re.match(r"^(?P<title>.+?)\.(?P<lang>[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,4})?)$", stem)
+    m = _RE_TITLE_LANG.match(stem)
     if m:
         return m.group("title")
     return stem
@@ -312,16 +626,15 @@ def _derive_title_from_srt_filename(srt_path: Path) -> str:
 
 def _extract_youtube_id(url: str) -> Optional[str]:
     """Attempt to extract the 11-char YouTube video ID from common URL forms."""
-    patterns = [
-        r"[?&]v=([A-Za-z0-9_-]{11})",
-        r"youtu\.be/([A-Za-z0-9_-]{11})",
-        r"/shorts/([A-Za-z0-9_-]{11})",
-        r"/embed/([A-Za-z0-9_-]{11})",
-    ]
-    for pat in patterns:
-        m = re.search(pat, url)
-        if m:
-            return m.group(1)
+    for marker in _YOUTUBE_ID_MARKERS:
+        pos = url.find(marker)
+        while pos != -1:
+            start = pos + len(marker)
+            candidate = url[start:start + 11]
+            is_param = marker != "v=" or (pos > 0 and url[pos - 1] in "?&")
+            if is_param and len(candidate) == 11 and _YOUTUBE_ID_CHARS.issuperset(candidate):
+                return candidate
+            pos = url.find(marker, pos + 1)
     return None
 
 
@@ -329,14 +642,12 @@ def _sanitize_title_for_filename(title: str) -> str:
     """Replace filesystem-problematic characters with hyphens and normalize dashes."""
     # Normalize Unicode to fold full-width punctuation, etc.
     s = unicodedata.normalize('NFKC', title)
-    # Normalize various dash-like characters to ASCII hyphen
-    s = re.sub(r"[\u2010\u2011\u2012\u2013\u2014\u2015\u2212\uFE58\uFE63\uFF0D]", "-", s)
-    # Replace forbidden characters with '-'
-    s = re.sub(r"[\\/:*?\"<>|]", "-", s)
+    # Normalize dash-like characters and replace forbidden characters with '-' in one pass
+    s = s.translate(_SANITIZE_MAP)
     # Collapse multiple spaces
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_SPACES.sub(" ", s).strip()
     # Collapse multiple hyphens
-    s = re.sub(r"-+", "-", s)
+    s = _RE_HYPHENS.sub("-", s)
     # Avoid names ending with a dot or space
     s = s.rstrip(" .")
     return s
@@ -348,6 +659,11 @@ if __name__ == "__main__":
     parser.add_argument("output", nargs="?", help="Path to output .csv file. Defaults to input name with .csv extension")
     parser.add_argument("--video", dest="video", help="Path to the corresponding video file for taking screenshots")
     parser.add_argument("--media-dir", dest="media_dir", help="Directory to save images (default: images next to CSV)")
+    parser.add_argument("--image-width", dest="image_width", type=int, default=DEFAULT_IMAGE_WIDTH, help=f"Maximum screenshot width in pixels; 0 keeps the video resolution (default: {DEFAULT_IMAGE_WIDTH})")
+    parser.add_argument("--image-format", dest="image_format", choices=["jpg", "webp"], default="jpg", help="Screenshot image format (default: jpg)")
+    parser.add_argument("--ffmpeg-jobs", dest="ffmpeg_jobs", type=int, default=os.cpu_count(), help="Maximum number of ffmpeg processes to run at once for screenshots (default: number of CPUs)")
+    parser.add_argument("--resume", dest="resume", action="store_true", help="If the output CSV already exists, append to it and skip subtitles it already contains")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Do not read or write the on-disk translation cache")
     # yt-dlp integration
     parser.add_argument("--yt-url", dest="yt_url", help="Video URL to download Spanish subtitles via yt-dlp (and optionally the video)")
     parser.add_argument("--yt-sub-langs", dest="yt_sub_langs", default="es,es-ES,es-419", help="Comma-separated subtitle language codes to request (default: es,es-ES,es-419)")
@@ -409,7 +725,8 @@ if __name__ == "__main__":
             video_id = _extract_youtube_id(args.yt_url)
             image_prefix = f"{raw_title} [{video_id}]" if video_id else raw_title
 
-        srt_to_anki_csv(input_path, final_output_path, video_path=args.video, media_dir=args.media_dir, image_name_prefix=image_prefix)
+        cache_path = None if args.no_cache else default_translation_cache_path()
+        srt_to_anki_csv(input_path, final_output_path, video_path=args.video, media_dir=args.media_dir, image_name_prefix=image_prefix, cache_path=cache_path, ffmpeg_jobs=args.ffmpeg_jobs, resume=args.resume, image_width=args.image_width, image_format=args.image_format)
     finally:
         if temp_dir_obj is not None:
             temp_dir_obj.cleanup()